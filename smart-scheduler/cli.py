@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""非交互式批处理命令行。
+
+任务在各子命令之间以 JSON Lines 流式传递（每行一个 ``Task.to_dict()``），
+因此可以用管道串联::
+
+    python main.py import tasks.json | python main.py optimize --horizon 7 \\
+        | python main.py export -o schedule.json
+
+每个子命令只在运行时导入自己需要的模块，保证进程启动足够快。
+"""
+import argparse
+import json
+import os
+import sys
+from typing import IO, Iterable, Iterator, List, Optional, Tuple
+
+# 复用编解码器实例，避免 json.dumps/json.loads 每行重新构造的开销
+_encode = json.JSONEncoder(ensure_ascii=False).encode
+_decode = json.JSONDecoder().decode
+
+
+def _open_input(path: str) -> IO:
+    if path == "-":
+        return sys.stdin
+    return open(path, 'r', encoding='utf-8')
+
+
+def _open_output(path: str) -> IO:
+    if path == "-":
+        return sys.stdout
+    return open(path, 'w', encoding='utf-8')
+
+
+def _close(stream: IO):
+    if stream not in (sys.stdin, sys.stdout):
+        stream.close()
+
+
+def read_task_dicts(stream: IO) -> Iterator[dict]:
+    """逐行读取 JSON Lines 任务流，跳过空行。"""
+    for _, data in _numbered_task_dicts(stream):
+        yield data
+
+
+def _numbered_task_dicts(stream: IO) -> Iterator[Tuple[int, dict]]:
+    for line_no, line in enumerate(stream, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            data = _decode(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"第 {line_no} 行不是合法的 JSON: {e}") from e
+        if not isinstance(data, dict):
+            raise ValueError(f"第 {line_no} 行不是任务对象: {line[:50]}")
+        yield line_no, data
+
+
+def _document_task_dicts(data) -> Iterator[dict]:
+    """校验 ``export_to_json`` 格式的文档并逐个返回任务。"""
+    if not isinstance(data, dict) or not isinstance(data.get("tasks"), list):
+        raise ValueError('导入文件必须是包含 "tasks" 列表的 JSON 对象，或 JSON Lines 任务流')
+    for index, task_data in enumerate(data["tasks"], 1):
+        if not isinstance(task_data, dict):
+            raise ValueError(f"第 {index} 个任务不是任务对象: {str(task_data)[:50]}")
+        yield task_data
+
+
+def read_tasks(stream: IO) -> Iterator:
+    """逐行读取任务流并转换成 ``Task``，字段缺失或类型不对时报告所在行号。"""
+    from task import Task
+
+    for line_no, data in _numbered_task_dicts(stream):
+        try:
+            task = Task.from_dict(data)
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"第 {line_no} 行不是合法的任务: {e!r}") from e
+
+        # from_dict 不检查这些字段的类型，排程和统计会直接使用它们
+        if isinstance(task.duration, bool) or not isinstance(task.duration, (int, float)):
+            raise ValueError(f"第 {line_no} 行的 duration 必须是数字: {task.duration!r}")
+        if not isinstance(task.dependencies, list) or not isinstance(task.tags, list):
+            raise ValueError(f"第 {line_no} 行的 dependencies 和 tags 必须是列表")
+        yield task
+
+
+def write_task_dicts(stream: IO, dicts: Iterable[dict]) -> int:
+    count = 0
+    write = stream.write
+    for data in dicts:
+        write(_encode(data))
+        write("\n")
+        count += 1
+    return count
+
+
+def cmd_import(args) -> int:
+    """把 ``export_to_json`` 格式（或 JSON Lines）的文件转换成任务流。"""
+    stream = _open_input(args.input)
+    try:
+        first = stream.readline()
+        while first and not first.strip():
+            first = stream.readline()
+
+        try:
+            head = json.loads(first) if first else None
+        except json.JSONDecodeError:
+            head = None
+
+        if not first:
+            # 空输入也写出空的任务流，保证 -o 指向的文件被创建或清空，
+            # 下游不会误读上一次运行留下的结果
+            def dicts():
+                return iter(())
+        elif isinstance(head, dict) and "tasks" not in head:
+            # 已经是 JSON Lines，逐行透传
+            def dicts():
+                yield head
+                yield from read_task_dicts(stream)
+        else:
+            data = head if head is not None else json.loads(first + stream.read())
+
+            def dicts():
+                return _document_task_dicts(data)
+
+        out = _open_output(args.output)
+        try:
+            write_task_dicts(out, dicts())
+        finally:
+            _close(out)
+    finally:
+        _close(stream)
+    return 0
+
+
+def cmd_optimize(args) -> int:
+    from datetime import datetime, timedelta
+    from scheduler import TaskScheduler
+
+    scheduler = TaskScheduler()
+    stream = _open_input(args.input)
+    try:
+        for task in read_tasks(stream):
+            scheduler.tasks[task.id] = task
+    finally:
+        _close(stream)
+
+    start_date = datetime.fromisoformat(args.start) if args.start else None
+    scheduled = scheduler.optimize(start_date)
+
+    if args.horizon is not None and scheduled:
+        limit = scheduled[0].start_time.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=args.horizon)
+        scheduled = [task for task in scheduled if task.end_time <= limit]
+
+    # 已完成的任务不参与排程，但仍原样输出，保证输出流中的依赖都能找到，
+    # 可以再次作为 optimize 的输入
+    completed = [task for task in scheduler.tasks.values() if task.completed]
+
+    out = _open_output(args.output)
+    try:
+        write_task_dicts(out, (task.to_dict() for task in completed + scheduled))
+    finally:
+        _close(out)
+    return 0
+
+
+def cmd_export(args) -> int:
+    """把任务流写成 ``import_from_json`` 可读取的 JSON 文件。"""
+    from datetime import datetime
+
+    stream = _open_input(args.input)
+    out = _open_output(args.output)
+    try:
+        out.write('{"tasks": [')
+        sep = "\n"
+        for data in read_task_dicts(stream):
+            out.write(sep)
+            out.write(_encode(data))
+            sep = ",\n"
+        out.write('\n], "exported_at": ')
+        out.write(json.dumps(datetime.now().isoformat()))
+        out.write("}\n")
+    finally:
+        _close(out)
+        _close(stream)
+    return 0
+
+
+def cmd_stats(args) -> int:
+    from scheduler import TaskScheduler
+
+    stream = _open_input(args.input)
+    try:
+        stats = TaskScheduler.compute_statistics(read_tasks(stream))
+    finally:
+        _close(stream)
+
+    out = _open_output(args.output)
+    try:
+        out.write(_encode(stats))
+        out.write("\n")
+    finally:
+        _close(out)
+    return 0
+
+
+def cmd_overdue(args) -> int:
+    from datetime import datetime
+
+    now = datetime.fromisoformat(args.now) if args.now else datetime.now()
+    stream = _open_input(args.input)
+    out = _open_output(args.output)
+    try:
+        write_task_dicts(out, (
+            task.to_dict() for task in read_tasks(stream)
+            if task.deadline and task.deadline < now and not task.completed
+        ))
+    finally:
+        _close(out)
+        _close(stream)
+    return 0
+
+
+def cmd_gantt(args) -> int:
+    from visualization import generate_gantt_chart
+
+    stream = _open_input(args.input)
+    try:
+        tasks = list(read_tasks(stream))
+    finally:
+        _close(stream)
+
+    mode = generate_gantt_chart(tasks, args.output, lane_by=args.lane_by, max_bars=args.max_bars)
+    print(_encode({"output": args.output, "tasks": len(tasks), "mode": mode}))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="main.py",
+        description="智能日程管理系统批处理命令。任务以 JSON Lines 在子命令之间传递，'-' 表示标准输入/输出。"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_io(sub, input_help="输入任务流 (JSON Lines)"):
+        sub.add_argument("input", nargs="?", default="-", help=input_help)
+        sub.add_argument("-o", "--output", default="-", help="输出路径 (默认标准输出)")
+
+    sub = subparsers.add_parser("import", help="将导出的 JSON 文件转换为任务流")
+    add_io(sub, "export_to_json 生成的文件或 JSON Lines 文件")
+    sub.set_defaults(func=cmd_import)
+
+    sub = subparsers.add_parser("optimize", help="对任务流进行日程优化")
+    add_io(sub)
+    sub.add_argument("--horizon", type=int, default=None, help="只输出起始日起 N 天内结束的任务 (已完成任务始终输出)")
+    sub.add_argument("--start", default=None, help="调度起始时间 (ISO 格式, 默认当前时间)")
+    sub.set_defaults(func=cmd_optimize)
+
+    sub = subparsers.add_parser("export", help="将任务流写为 JSON 导出文件")
+    add_io(sub)
+    sub.set_defaults(func=cmd_export)
+
+    sub = subparsers.add_parser("stats", help="输出任务流的统计信息 (JSON)")
+    add_io(sub)
+    sub.set_defaults(func=cmd_stats)
+
+    sub = subparsers.add_parser("overdue", help="筛选出逾期未完成的任务")
+    add_io(sub)
+    sub.add_argument("--now", default=None, help="参考时间 (ISO 格式, 默认当前时间)")
+    sub.set_defaults(func=cmd_overdue)
+
+    sub = subparsers.add_parser("gantt", help="将优化后的任务流渲染为甘特图 (PNG/SVG)")
+    sub.add_argument("input", nargs="?", default="-", help="optimize 输出的任务流 (JSON Lines)")
+    sub.add_argument("-o", "--output", required=True, help="图片路径，格式由扩展名决定")
+    sub.add_argument("--lane-by", choices=["task", "priority", "tag"], default=None,
+                     help="分行方式 (默认任务少时按任务，否则按优先级)")
+    sub.add_argument("--max-bars", type=int, default=5000, help="超过该任务数时按天和泳道聚合")
+    sub.set_defaults(func=cmd_gantt)
+
+    return parser
+
+
+def run(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except BrokenPipeError:
+        # 下游 (如 head) 提前关闭管道时静默退出
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        return 0
+    except (OSError, ValueError, KeyError) as e:
+        print(f"错误: {e}", file=sys.stderr)
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,4 +1,11 @@
 #!/usr/bin/env python3
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # 批处理命令在导入交互界面依赖之前分发，各子命令只加载自己需要的模块
+    from cli import run
+    sys.exit(run(sys.argv[1:]))
+
 from scheduler import TaskScheduler
 from task import Priority
 from datetime import datetime, timedelta
@@ -1,7 +1,7 @@
 import json
 import heapq
 from datetime import datetime, timedelta
-from typing import List, Dict, Set
+from typing import List, Dict, Set, Iterable
 from collections import defaultdict, deque
 from task import Task, Priority
 
@@ -144,13 +144,24 @@ class TaskScheduler:
             task.completed = True
     
     def get_statistics(self) -> Dict:
-        total = len(self.tasks)
-        completed = sum(1 for task in self.tasks.values() if task.completed)
-        in_progress = sum(1 for task in self.tasks.values() 
-                         if not task.completed and task.start_time and task.start_time <= datetime.now())
+        return self.compute_statistics(self.tasks.values())
+    
+    @staticmethod
+    def compute_statistics(tasks: Iterable[Task], now: datetime = None) -> Dict:
+        if now is None:
+            now = datetime.now()
+        
+        total = completed = in_progress = 0
+        total_duration = completed_duration = 0
         
-        total_duration = sum(task.duration for task in self.tasks.values())
-        completed_duration = sum(task.duration for task in self.tasks.values() if task.completed)
+        for task in tasks:
+            total += 1
+            total_duration += task.duration
+            if task.completed:
+                completed += 1
+                completed_duration += task.duration
+            elif task.start_time and task.start_time <= now:
+                in_progress += 1
         
         return {
             "total_tasks": total,
@@ -1,8 +1,13 @@
+import json
+import os
+import tempfile
 import unittest
 from datetime import datetime, timedelta
 from scheduler import TaskScheduler
 from task import Task, Priority
 from advanced_features import DurationPredictor, ConflictResolver, PriorityCalculator
+from cli import run
+from visualization import aggregate_load, generate_gantt_chart
 
 class TestTaskScheduler(unittest.TestCase):
     def setUp(self):
@@ -71,10 +76,12 @@ class TestDurationPredictor(unittest.TestCase):
     
     def test_save_load_model(self):
         self.predictor.add_history("测试任务", 45)
-        self.predictor.save_model("test_model.pkl")
-        
-        new_predictor = DurationPredictor()
-        new_predictor.load_model("test_model.pkl")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            model_path = os.path.join(tmpdir, "test_model.pkl")
+            self.predictor.save_model(model_path)
+            
+            new_predictor = DurationPredictor()
+            new_predictor.load_model(model_path)
         
         predicted = new_predictor.predict("测试任务")
         self.assertEqual(predicted, 45)
@@ -120,5 +127,228 @@ class TestConflictResolver(unittest.TestCase):
         self.assertEqual(len(resolved), 2)
         self.assertGreaterEqual(resolved[1].start_time, resolved[0].end_time)
 
+class TestBatchCLI(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.scheduler = TaskScheduler()
+        self.scheduler.add_task(name="任务1", duration=60,
+                                deadline=datetime(2020, 1, 1, 12, 0))
+        self.scheduler.add_task(name="任务2", duration=480, dependencies=["task_0"])
+        self.scheduler.add_task(name="任务3", duration=30, dependencies=["task_1"])
+        self.scheduler.mark_completed("task_2")
+        self.source = self.path("tasks.json")
+        self.scheduler.export_to_json(self.source)
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def path(self, name):
+        return os.path.join(self.tmpdir.name, name)
+    
+    def read_lines(self, name):
+        with open(self.path(name), encoding='utf-8') as f:
+            return [json.loads(line) for line in f]
+    
+    def test_import_optimize_export_roundtrip(self):
+        self.assertEqual(run(["import", self.source, "-o", self.path("tasks.jsonl")]), 0)
+        self.assertEqual(len(self.read_lines("tasks.jsonl")), 3)
+        
+        self.assertEqual(run(["optimize", self.path("tasks.jsonl"), "--start", "2030-01-01T09:00",
+                              "-o", self.path("plan.jsonl")]), 0)
+        plan = self.read_lines("plan.jsonl")
+        self.assertEqual([t["id"] for t in plan], ["task_2", "task_0", "task_1"])
+        self.assertTrue(plan[0]["completed"])
+        self.assertEqual(plan[1]["start_time"], "2030-01-01T09:00:00")
+        
+        self.assertEqual(run(["export", self.path("plan.jsonl"), "-o", self.path("out.json")]), 0)
+        imported = TaskScheduler()
+        imported.import_from_json(self.path("out.json"))
+        self.assertEqual(len(imported.tasks), 3)
+    
+    def test_optimize_own_output(self):
+        with open(self.path("tasks.jsonl"), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"id": "task_0", "name": "a", "completed": True}) + "\n")
+            f.write(json.dumps({"id": "task_1", "name": "b", "dependencies": ["task_0"]}) + "\n")
+        
+        args = ["--start", "2030-01-01T09:00"]
+        self.assertEqual(run(["optimize", self.path("tasks.jsonl"), "-o", self.path("plan.jsonl")] + args), 0)
+        self.assertEqual(run(["export", self.path("plan.jsonl"), "-o", self.path("out.json")]), 0)
+        self.assertEqual(run(["import", self.path("out.json"), "-o", self.path("again.jsonl")]), 0)
+        self.assertEqual(run(["optimize", self.path("again.jsonl"), "-o", self.path("replan.jsonl")] + args), 0)
+        self.assertEqual(self.read_lines("replan.jsonl"), self.read_lines("plan.jsonl"))
+    
+    def test_import_empty_input_truncates_output(self):
+        with open(self.path("empty.json"), 'w', encoding='utf-8') as f:
+            f.write("\n  \n")
+        with open(self.path("tasks.jsonl"), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"id": "task_0", "name": "旧任务"}) + "\n")
+        
+        self.assertEqual(run(["import", self.path("empty.json"), "-o", self.path("tasks.jsonl")]), 0)
+        self.assertEqual(self.read_lines("tasks.jsonl"), [])
+        
+        self.assertEqual(run(["import", self.path("empty.json"), "-o", self.path("new.jsonl")]), 0)
+        self.assertTrue(os.path.exists(self.path("new.jsonl")))
+    
+    def test_optimize_horizon(self):
+        with open(self.path("long.jsonl"), 'w', encoding='utf-8') as f:
+            for i in range(3):
+                f.write(json.dumps({"id": f"task_{i}", "name": f"任务{i}", "duration": 600}) + "\n")
+        
+        run(["optimize", self.path("long.jsonl"), "--start", "2030-01-01T09:00", "--horizon", "2",
+             "-o", self.path("plan.jsonl")])
+        self.assertEqual([t["id"] for t in self.read_lines("plan.jsonl")], ["task_0", "task_1"])
+    
+    def test_stats_and_overdue(self):
+        run(["import", self.source, "-o", self.path("tasks.jsonl")])
+        
+        run(["stats", self.path("tasks.jsonl"), "-o", self.path("stats.json")])
+        with open(self.path("stats.json"), encoding='utf-8') as f:
+            stats = json.load(f)
+        self.assertEqual(stats, self.scheduler.get_statistics())
+        
+        run(["overdue", self.path("tasks.jsonl"), "-o", self.path("overdue.jsonl")])
+        self.assertEqual([t["id"] for t in self.read_lines("overdue.jsonl")], ["task_0"])
+    
+    def test_malformed_input_exit_code(self):
+        with open(self.path("list.json"), 'w', encoding='utf-8') as f:
+            f.write("[1, 2]\n")
+        with open(self.path("rows.jsonl"), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"id": "task_0", "name": "a"}) + "\n[1, 2]\n")
+        with open(self.path("doc.json"), 'w', encoding='utf-8') as f:
+            json.dump({"tasks": [{"id": "task_0", "name": "a"}, 3]}, f)
+        
+        out = ["-o", self.path("out.jsonl")]
+        self.assertEqual(run(["import", self.path("list.json")] + out), 1)
+        self.assertEqual(run(["import", self.path("rows.jsonl")] + out), 1)
+        self.assertEqual(run(["import", self.path("doc.json")] + out), 1)
+        self.assertEqual(run(["stats", self.path("list.json")] + out), 1)
+        self.assertEqual(run(["stats", self.path("rows.jsonl")] + out), 1)
+        
+        bad_rows = [
+            ("optimize", {"id": "task_0", "name": "a", "duration": "60"}),
+            ("overdue", {"id": "task_0", "name": "a", "deadline": 5}),
+            ("stats", {"id": "task_0", "name": "a", "duration": None}),
+            ("optimize", {"id": "task_0", "name": "a", "dependencies": 5}),
+            ("stats", {"id": "task_0", "name": "a", "priority": "soon"}),
+            ("stats", {"name": "a"}),
+        ]
+        for command, row in bad_rows:
+            with open(self.path("bad.jsonl"), 'w', encoding='utf-8') as f:
+                f.write(json.dumps(row) + "\n")
+            self.assertEqual(run([command, self.path("bad.jsonl")] + out), 1, row)
+    
+    def test_circular_dependency_exit_code(self):
+        with open(self.path("cycle.jsonl"), 'w', encoding='utf-8') as f:
+            f.write(json.dumps({"id": "task_0", "name": "a", "dependencies": ["task_1"]}) + "\n")
+            f.write(json.dumps({"id": "task_1", "name": "b", "dependencies": ["task_0"]}) + "\n")
+        
+        self.assertEqual(run(["optimize", self.path("cycle.jsonl"), "-o", self.path("plan.jsonl")]), 1)
+
+class TestGanttChart(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.scheduler = TaskScheduler()
+        priorities = list(Priority)
+        for i in range(200):
+            self.scheduler.add_task(name=f"任务{i}", duration=30 + i % 60,
+                                    priority=priorities[i % 4], tags=[f"tag{i % 3}"])
+        self.scheduled = self.scheduler.optimize(datetime(2030, 1, 1))
+    
+    def tearDown(self):
+        self.tmpdir.cleanup()
+    
+    def test_render_bars(self):
+        path = os.path.join(self.tmpdir.name, "plan.png")
+        mode = generate_gantt_chart(self.scheduled[:20], path)
+        self.assertEqual(mode, "bars")
+        self.assertGreater(os.path.getsize(path), 0)
+    
+    def test_render_aggregated_svg(self):
+        path = os.path.join(self.tmpdir.name, "plan.svg")
+        mode = generate_gantt_chart(self.scheduled, path, lane_by="tag", max_bars=50)
+        self.assertEqual(mode, "aggregated")
+        self.assertGreater(os.path.getsize(path), 0)
+    
+    def test_duplicate_task_ids_share_lane(self):
+        tasks = self.scheduled[:5]
+        duplicate = Task.from_dict(tasks[0].to_dict())
+        duplicate.start_time = tasks[-1].end_time
+        duplicate.end_time = duplicate.start_time + timedelta(minutes=30)
+        
+        path = os.path.join(self.tmpdir.name, "plan.png")
+        self.assertEqual(generate_gantt_chart(tasks + [duplicate], path, lane_by="task"), "bars")
+    
+    def test_default_lanes_follow_max_bars(self):
+        path = os.path.join(self.tmpdir.name, "plan.png")
+        mode = generate_gantt_chart(self.scheduled[:30], path, max_bars=10)
+        self.assertEqual(mode, "aggregated")
+    
+    def test_render_without_glyph_warnings(self):
+        import warnings
+        
+        path = os.path.join(self.tmpdir.name, "plan.png")
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter("always")
+            generate_gantt_chart(self.scheduled, path, lane_by="tag", max_bars=50)
+            generate_gantt_chart(self.scheduled[:10], path)
+        self.assertEqual([str(w.message) for w in caught if "Glyph" in str(w.message)], [])
+    
+    def test_default_lanes_count_scheduled_tasks_only(self):
+        from unittest import mock
+        import visualization
+        
+        unscheduled = [Task(id=f"extra_{i}", name=f"未排程{i}") for i in range(100)]
+        path = os.path.join(self.tmpdir.name, "plan.png")
+        with mock.patch.object(visualization, "_collect", wraps=visualization._collect) as collect:
+            generate_gantt_chart(self.scheduled[:20] + unscheduled, path, max_bars=50)
+        self.assertEqual(collect.call_args.args[1], "task")
+    
+    def test_zero_duration_single_task(self):
+        import warnings
+        
+        task = Task(id="task_0", name="里程碑", duration=0)
+        task.start_time = task.end_time = datetime(2030, 1, 1, 9, 0)
+        path = os.path.join(self.tmpdir.name, "plan.png")
+        with warnings.catch_warnings():
+            warnings.simplefilter("error")
+            self.assertEqual(generate_gantt_chart([task], path), "bars")
+    
+    def test_task_lanes_rejected_when_aggregating(self):
+        path = os.path.join(self.tmpdir.name, "plan.png")
+        with self.assertRaises(ValueError):
+            generate_gantt_chart(self.scheduled, path, lane_by="task", max_bars=50)
+    
+    def test_aggregate_load(self):
+        import numpy as np
+        
+        starts = np.array([0.4, 0.5, 1.4, 3.4])
+        durations = np.array([0.1, 0.2, 0.1, 0.05])
+        lanes = np.array([0, 1, 0, 1])
+        
+        bucket_days, load = aggregate_load(starts, durations, lanes, n_lanes=2, max_bars=4)
+        self.assertEqual(bucket_days, 2)
+        self.assertEqual(load.shape, (2, 2))
+        self.assertAlmostEqual(load.sum(), durations.sum())
+        self.assertAlmostEqual(load[0, 0], 0.2)
+        self.assertAlmostEqual(load[1, 1], 0.05)
+    
+    def test_aggregate_load_respects_max_bars(self):
+        import numpy as np
+        
+        rng = np.random.default_rng(0)
+        for span in (1, 7, 10, 99, 1000):
+            for n_lanes in (1, 3, 4, 7):
+                for max_bars in (n_lanes, 5 + n_lanes, 50, 997):
+                    starts = rng.uniform(0, span - 0.1, 100)
+                    durations = np.full(100, 0.1)
+                    lanes = rng.integers(0, n_lanes, 100)
+                    
+                    _, load = aggregate_load(starts, durations, lanes, n_lanes, max_bars)
+                    self.assertLessEqual(load.size, max_bars)
+                    self.assertAlmostEqual(load.sum(), durations.sum())
+        
+        with self.assertRaises(ValueError):
+            aggregate_load(np.zeros(3), np.ones(3), np.arange(3), n_lanes=3, max_bars=2)
+
 if __name__ == '__main__':
     unittest.main()
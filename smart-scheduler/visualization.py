@@ -0,0 +1,234 @@
+"""甘特图 / 时间线导出。
+
+所有任务条绘制在同一个 ``PolyCollection`` 中，而不是每个任务一个 artist。
+任务数超过 ``max_bars`` 时，按"泳道 × 时间桶"聚合忙碌时长后再绘制，
+图元数量不超过 ``max_bars``，内存只随任务数线性增长（每个任务几个浮点数）。
+渲染不依赖 GUI 后端，可直接在服务器上输出 PNG / SVG。
+"""
+import math
+import warnings
+from functools import lru_cache
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from matplotlib import dates as mdates
+from matplotlib import font_manager, rc_context
+from matplotlib.collections import PolyCollection
+from matplotlib.figure import Figure
+
+from task import Task, Priority
+
+LANE_PRIORITY = "priority"
+LANE_TAG = "tag"
+LANE_TASK = "task"
+
+# 超过该泳道数时不再按任务分行，也不再绘制 y 轴标签
+MAX_LABELED_LANES = 60
+
+# 常见中文字体；都没有安装时 (如无界面的服务器) 图表文字改用英文
+CJK_FONTS = ["Noto Sans CJK SC", "Source Han Sans SC", "WenQuanYi Zen Hei",
+             "SimHei", "Microsoft YaHei", "PingFang SC"]
+
+UNTAGGED = "无标签"
+
+TEXTS_ZH = {
+    "title": "日程甘特图",
+    "load": "日均忙碌 (小时)",
+    "aggregated": "{title} ({count} 个任务, 每 {days} 天聚合)",
+    "untagged": UNTAGGED
+}
+
+TEXTS_EN = {
+    "title": "Schedule",
+    "load": "Avg busy hours / day",
+    "aggregated": "{title} ({count} tasks, {days}-day buckets)",
+    "untagged": "untagged"
+}
+
+PRIORITY_COLORS = {
+    Priority.URGENT: "#d62728",
+    Priority.HIGH: "#ff7f0e",
+    Priority.MEDIUM: "#f2c40f",
+    Priority.LOW: "#2ca02c"
+}
+
+
+@lru_cache(maxsize=None)
+def find_cjk_font() -> Optional[str]:
+    """返回已安装的第一个中文字体名称，没有则返回 ``None``。"""
+    installed = {font.name for font in font_manager.fontManager.ttflist}
+    for name in CJK_FONTS:
+        if name in installed:
+            return name
+    return None
+
+
+def _lane_key_func(lane_by: str) -> Callable[[Task], str]:
+    if lane_by == LANE_PRIORITY:
+        return lambda task: task.priority.value
+    if lane_by == LANE_TAG:
+        return lambda task: task.tags[0] if task.tags else UNTAGGED
+    if lane_by == LANE_TASK:
+        return lambda task: task.id
+    raise ValueError(f"未知的分行方式: {lane_by}")
+
+
+def _collect(scheduled: List[Task], lane_by: str) -> Tuple[float, np.ndarray, np.ndarray, np.ndarray, List[str]]:
+    """一次遍历把已排程的任务转换成 (起点, 时长, 泳道) 数组，时间单位为天。"""
+    base = min(task.start_time for task in scheduled).replace(hour=0, minute=0, second=0, microsecond=0)
+    n = len(scheduled)
+    key_of = _lane_key_func(lane_by)
+
+    lanes: Dict[str, int] = {}
+    if lane_by == LANE_PRIORITY:
+        for priority in Priority:
+            lanes[priority.value] = len(lanes)
+
+    starts = np.empty(n)
+    durations = np.empty(n)
+    lane_idx = np.empty(n, dtype=np.int64)
+    for i, task in enumerate(scheduled):
+        starts[i] = (task.start_time - base).total_seconds()
+        durations[i] = (task.end_time - task.start_time).total_seconds()
+        lane_idx[i] = lanes.setdefault(key_of(task), len(lanes))
+
+    starts /= 86400
+    durations /= 86400
+
+    labels = list(lanes)
+    if lane_by == LANE_TASK:
+        # 按泳道 (任务 id) 取名称，重复 id 的任务共用一行
+        names: Dict[str, str] = {}
+        for task in scheduled:
+            names.setdefault(task.id, task.name)
+        labels = [names[task_id] for task_id in labels]
+    elif lane_by == LANE_TAG:
+        # 标签泳道按名称排序，保证输出稳定
+        order = sorted(range(len(labels)), key=labels.__getitem__)
+        remap = np.empty(len(labels), dtype=np.int64)
+        remap[order] = np.arange(len(labels))
+        lane_idx = remap[lane_idx]
+        labels = [labels[i] for i in order]
+
+    return mdates.date2num(base), starts, durations, lane_idx, labels
+
+
+def _rect_verts(x0: np.ndarray, width: np.ndarray, y: np.ndarray, height: float) -> np.ndarray:
+    verts = np.empty((len(x0), 4, 2))
+    x1 = x0 + width
+    y0 = y - height / 2
+    y1 = y + height / 2
+    verts[:, 0, 0] = x0
+    verts[:, 0, 1] = y0
+    verts[:, 1, 0] = x0
+    verts[:, 1, 1] = y1
+    verts[:, 2, 0] = x1
+    verts[:, 2, 1] = y1
+    verts[:, 3, 0] = x1
+    verts[:, 3, 1] = y0
+    return verts
+
+
+def aggregate_load(starts: np.ndarray, durations: np.ndarray, lane_idx: np.ndarray,
+                   n_lanes: int, max_bars: int) -> Tuple[int, np.ndarray]:
+    """按 (时间桶, 泳道) 汇总忙碌时长（天）。
+
+    时间桶宽度至少一天，取保证桶数 × 泳道数不超过 ``max_bars`` 的最小整数天数；
+    泳道数本身超过 ``max_bars`` 时抛出 ``ValueError``。任务的全部时长计入其开始时间所在的桶。
+    返回 (桶宽度, 形状为 (桶数, 泳道数) 的矩阵)。
+    """
+    max_buckets = max_bars // n_lanes
+    if max_buckets < 1:
+        raise ValueError(f"泳道数 {n_lanes} 超过了 max_bars={max_bars}，请增大 max_bars 或改用 priority 分行")
+
+    span_days = max(1, int(math.ceil((starts + durations).max())))
+    # ceil(span / ceil(span / m)) <= m，桶数不会超过 max_buckets
+    bucket_days = int(math.ceil(span_days / max_buckets))
+    n_buckets = int(math.ceil(span_days / bucket_days))
+
+    bucket = np.minimum((starts // bucket_days).astype(np.int64), n_buckets - 1)
+    load = np.bincount(bucket * n_lanes + lane_idx, weights=durations,
+                       minlength=n_buckets * n_lanes)
+    return bucket_days, load.reshape(n_buckets, n_lanes)
+
+
+def generate_gantt_chart(tasks: Sequence[Task], filepath: str, lane_by: Optional[str] = None,
+                         max_bars: int = 5000, title: Optional[str] = None, dpi: int = 100) -> str:
+    """把 ``optimize()`` 的结果渲染成甘特图并保存，格式由文件扩展名决定 (png/svg/pdf)。
+
+    ``lane_by`` 可选 ``"task"``（每个任务一行）、``"priority"`` 或 ``"tag"``；默认在已排程的任务数不超过
+    ``MAX_LABELED_LANES`` 和 ``max_bars`` 时按任务分行，否则按优先级分行。任务数超过 ``max_bars`` 时改为绘制每个泳道在每个
+    时间桶内的忙碌时长。返回实际使用的绘制模式 ``"bars"`` 或 ``"aggregated"``。
+
+    系统中没有中文字体时，标题等固定文字改用英文，任务名中缺字的警告也不会输出。
+    """
+    scheduled = [task for task in tasks if task.start_time and task.end_time]
+    if not scheduled:
+        raise ValueError("没有已安排时间的任务，请先调用 optimize()")
+
+    if lane_by is None:
+        lane_by = LANE_TASK if len(scheduled) <= min(MAX_LABELED_LANES, max_bars) else LANE_PRIORITY
+
+    origin, starts, durations, lane_idx, labels = _collect(scheduled, lane_by)
+    n_lanes = len(labels)
+    aggregated = len(scheduled) > max_bars
+
+    if aggregated and lane_by == LANE_TASK:
+        raise ValueError(f"按任务分行最多支持 {max_bars} 个任务，请改用 priority 或 tag 分行")
+
+    cjk_font = find_cjk_font()
+    texts = TEXTS_ZH if cjk_font else TEXTS_EN
+    if title is None:
+        title = texts["title"]
+    if lane_by == LANE_TAG:
+        labels = [texts["untagged"] if label == UNTAGGED else label for label in labels]
+
+    rc = {"axes.unicode_minus": False}
+    if cjk_font:
+        rc["font.sans-serif"] = [cjk_font, "DejaVu Sans"]
+
+    with rc_context(rc), warnings.catch_warnings():
+        # 任务名中可能有当前字体缺少的字符，每个字符一条警告会刷满批处理任务的 stderr
+        warnings.filterwarnings("ignore", message="Glyph .* missing from", category=UserWarning)
+        height = min(max(2.5, 0.3 * n_lanes + 1.5), 30)
+        fig = Figure(figsize=(12, height), dpi=dpi)
+        ax = fig.add_subplot()
+
+        if aggregated:
+            bucket_days, load = aggregate_load(starts, durations, lane_idx, n_lanes, max_bars)
+            bucket_ids, lane_ids = np.nonzero(load)
+            verts = _rect_verts(origin + bucket_ids * bucket_days, np.full(len(bucket_ids), bucket_days),
+                                lane_ids, 0.8)
+            # 每桶忙碌时长换算为每天平均小时数，便于不同桶宽之间比较
+            values = load[bucket_ids, lane_ids] * 24 / bucket_days
+            collection = PolyCollection(verts, array=values, cmap="viridis", edgecolors="none")
+            ax.add_collection(collection)
+            fig.colorbar(collection, ax=ax, label=texts["load"])
+            x_min, x_max = origin, origin + load.shape[0] * bucket_days
+            ax.set_title(texts["aggregated"].format(title=title, count=len(scheduled), days=bucket_days))
+        else:
+            colors = [PRIORITY_COLORS[task.priority] for task in scheduled]
+            verts = _rect_verts(origin + starts, durations, lane_idx, 0.6)
+            # 细描边保证很短的任务在缩小后仍然可见
+            ax.add_collection(PolyCollection(verts, facecolors=colors, edgecolors=colors, linewidths=0.5))
+            x_min, x_max = origin + starts.min(), origin + (starts + durations).max()
+            ax.set_title(title)
+
+        if x_max <= x_min:
+            # 只有零时长任务时左右边界重合，补一小时避免坐标轴退化
+            x_max = x_min + 1 / 24
+        ax.set_xlim(x_min, x_max)
+        ax.set_ylim(n_lanes - 0.5, -0.5)
+        if n_lanes <= MAX_LABELED_LANES:
+            ax.set_yticks(range(n_lanes), labels)
+        else:
+            ax.set_yticks([])
+
+        locator = mdates.AutoDateLocator()
+        ax.xaxis.set_major_locator(locator)
+        ax.xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+        ax.grid(axis="x", alpha=0.3)
+
+        fig.tight_layout()
+        fig.savefig(filepath)
+    return "aggregated" if aggregated else "bars"